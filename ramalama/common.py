@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import base64
 import glob
 import hashlib
+import io
 import json
+import logging
+import mmap
 import os
 import platform
-import random
 import re
+import shlex
 import shutil
-import string
 import subprocess
 import sys
+import tarfile
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import IO, TYPE_CHECKING, Any, Literal, Optional, Protocol, TypedDict, Union, cast, get_args
 
@@ -43,16 +48,29 @@ RAG_CONTENT = f"{MNT_DIR}/vector.db"
 
 MIN_VRAM_BYTES = 1073741824  # 1GiB
 
-SPLIT_MODEL_PATH_RE = r'(.*?)(?:/)?([^/]*)-00001-of-(\d{5})\.gguf'
+PIPE_BUFFER_SIZE = 1 << 20  # 1MiB
+CHECKSUM_BUFFER_SIZE = 1 << 20  # 1MiB
+CHECKSUM_MMAP_THRESHOLD = 8 << 20  # 8MiB
+# Supported checksum filename prefixes and the length of their hex digests
+CHECKSUM_DIGEST_LENGTHS = {"sha256": 64, "blake3": 64, "xxh3": 16}
+
+# hashlib.sha256 is the OpenSSL-backed constructor when available, bound once to skip the attribute lookups
+_sha256 = hashlib.sha256
+
+SPLIT_MODEL_PATH_RE = re.compile(r'(.*?)(?:/)?([^/]*)-00001-of-(\d{5})\.gguf')
 
 
 def is_split_file_model(model_path):
     """returns true if ends with -%05d-of-%05d.gguf"""
-    return bool(re.match(SPLIT_MODEL_PATH_RE, model_path))
+    return SPLIT_MODEL_PATH_RE.match(model_path) is not None
+
+
+# Extending this table changes the on-disk names of existing model store entries
+_FILENAME_TRANSLATION = str.maketrans({":": "-"})
 
 
 def sanitize_filename(filename: str) -> str:
-    return filename.replace(":", "-")
+    return filename.translate(_FILENAME_TRANSLATION)
 
 
 podman_machine_accel = False
@@ -95,12 +113,26 @@ def handle_provider(machine, config: Optional[Config] = None) -> Optional[bool]:
     return None
 
 
-def apple_vm(engine: SUPPORTED_ENGINES, config: Optional[Config] = None) -> bool:
+@lru_cache(maxsize=4)
+def _list_podman_machines(engine: SUPPORTED_ENGINES) -> list[dict[str, Any]]:
+    """Lists the podman machines once per process, their state does not change during a command.
+
+    Long-running processes can call _list_podman_machines.cache_clear() to pick up changes.
+    """
     podman_machine_list = [engine, "machine", "list", "--format", "json", "--all-providers"]
+    # Both parsers accept bytes directly, no need to decode the whole listing first
+    machines_json = run_cmd(podman_machine_list, ignore_stderr=True).stdout
     try:
-        machines_json = run_cmd(podman_machine_list, ignore_stderr=True, encoding="utf-8").stdout.strip()
-        machines = json.loads(machines_json)
-        for machine in machines:
+        import orjson  # type: ignore
+    except ImportError:
+        return json.loads(machines_json)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, callers handle both the same way
+    return orjson.loads(machines_json)
+
+
+def apple_vm(engine: SUPPORTED_ENGINES, config: Optional[Config] = None) -> bool:
+    try:
+        for machine in _list_podman_machines(engine):
             result = handle_provider(machine, config)
             if result is not None:
                 return result
@@ -113,17 +145,24 @@ def perror(*args, **kwargs):
     print(*args, file=sys.stderr, **kwargs)
 
 
+@lru_cache(maxsize=64)
+def _which(cmd: str, path: Optional[str]) -> Optional[str]:
+    return shutil.which(cmd, path=path)
+
+
 def available(cmd: str) -> bool:
-    return shutil.which(cmd) is not None
+    # Keyed on $PATH as well, so that changes to it are still honoured
+    return _which(cmd, os.environ.get("PATH")) is not None
 
 
 def quoted(arr) -> str:
-    """Return string with quotes around elements containing spaces."""
-    return " ".join(['"' + element + '"' if ' ' in element else element for element in arr])
+    """Return a shell-escaped string of the command line."""
+    return shlex.join(arr)
 
 
 def exec_cmd(args, stdout2null: bool = False, stderr2null: bool = False):
-    logger.debug(f"exec_cmd: {quoted(args)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("exec_cmd: %s", quoted(args))
 
     stdout_target = subprocess.DEVNULL if stdout2null else None
     stderr_target = subprocess.DEVNULL if stderr2null else None
@@ -156,11 +195,12 @@ def run_cmd(
     ignore_all: if True, ignore both standard output and standard error
     encoding: encoding to apply to the result text
     """
-    logger.debug(f"run_cmd: {quoted(args)}")
-    logger.debug(f"Working directory: {cwd}")
-    logger.debug(f"Ignore stderr: {ignore_stderr}")
-    logger.debug(f"Ignore all: {ignore_all}")
-    logger.debug(f"env: {env}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("run_cmd: %s", quoted(args))
+        logger.debug("Working directory: %s", cwd)
+        logger.debug("Ignore stderr: %s", ignore_stderr)
+        logger.debug("Ignore all: %s", ignore_all)
+        logger.debug("env: %s", env)
 
     serr = None
     if ignore_all or ignore_stderr:
@@ -171,23 +211,167 @@ def run_cmd(
         sout = subprocess.DEVNULL
 
     if env:
-        env = os.environ | env
+        # Let the child inherit our environment unless the overlay actually changes it
+        env = os.environ | env if any(os.environ.get(k) != v for k, v in env.items()) else None
 
     result = subprocess.run(
         args, check=True, cwd=cwd, stdout=sout, stderr=serr, stdin=stdin, encoding=encoding, env=env
     )
-    logger.debug(f"Command finished with return code: {result.returncode}")
+    logger.debug("Command finished with return code: %s", result.returncode)
 
     return result
 
 
+def _set_pipe_size(pipe: Union[int, IO[Any]], size: int = PIPE_BUFFER_SIZE) -> None:
+    """Grow the kernel buffer of a pipe on Linux, silently keeping the default if not permitted."""
+    if platform.system() != "Linux":
+        return
+
+    import fcntl
+
+    try:
+        # F_SETPIPE_SZ is only exposed by the fcntl module on Python 3.10+
+        fcntl.fcntl(pipe, getattr(fcntl, "F_SETPIPE_SZ", 1031), size)
+    except OSError as e:
+        logger.debug(f"Failed to resize pipe buffer to {size} bytes: {e}")
+
+
+def _docker_daemon_is_local() -> bool:
+    """Whether docker talks to a daemon on this host through its default unix socket."""
+    # Docker Desktop runs the daemon in a VM on every platform
+    if platform.system() != "Linux":
+        return False
+    if os.getenv("DOCKER_HOST") or os.getenv("CONTAINER_HOST"):
+        return False
+
+    context = os.getenv("DOCKER_CONTEXT")
+    if context is None:
+        config_dir = os.getenv("DOCKER_CONFIG") or os.path.expanduser("~/.docker")
+        try:
+            with open(os.path.join(config_dir, "config.json")) as f:
+                context = json.load(f).get("currentContext")
+        except (OSError, ValueError, AttributeError):
+            context = None
+    return context in (None, "", "default")
+
+
+def _volume_mountpoint(engine: str, volume: str) -> Optional[str]:
+    """Returns the host path of a volume if this process can write to it directly."""
+    # Without tarfile's "data" filter (Python < 3.9.17, 3.10.12, 3.11.4) links in the image could point
+    # outside of the volume, keep extracting inside a container there.
+    if not hasattr(tarfile, "data_filter"):
+        return None
+    # The mountpoint of a remote or VM-hosted daemon can exist locally as well, since volume names only
+    # depend on the model. Writing there would leave the volume the container mounts empty.
+    if not _docker_daemon_is_local():
+        return None
+
+    try:
+        mountpoint = run_cmd(
+            [engine, "volume", "inspect", "--format", "{{.Mountpoint}}", volume],
+            ignore_stderr=True,
+            encoding="utf-8",
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+    if mountpoint and os.access(mountpoint, os.W_OK):
+        return mountpoint
+    return None
+
+
+def _extract_from_export(export_cmd: list[str], member_name: str, dest: str) -> None:
+    """Streams the export into Python's tar parser and extracts member_name into dest, stripping its first path
+    component like tar --strip-components=1."""
+    with subprocess.Popen(export_cmd, stdout=subprocess.PIPE, bufsize=PIPE_BUFFER_SIZE) as p_out:
+        _set_pipe_size(p_out.stdout)  # type: ignore
+        try:
+            # Copy the member in large chunks instead of tarfile's default 16KiB, it is usually several GiB.
+            # copybufsize is passed on to TarFile but missing from the tarfile.open stubs.
+            with tarfile.open(
+                fileobj=p_out.stdout,
+                mode="r|",
+                copybufsize=PIPE_BUFFER_SIZE,  # type: ignore[call-overload]
+            ) as tar:
+                for member in tar:
+                    if member.name != member_name:
+                        continue
+                    member.name = member.name.split("/", 1)[1]
+                    tar.extract(member, path=dest, filter="data")
+                    # Nothing else is needed from the rootfs, stop the export early
+                    p_out.kill()
+                    return
+        except tarfile.ReadError:
+            # A failed export leaves an empty or truncated stream, report it like the container fallback does
+            rc = p_out.wait()
+            if rc != 0:
+                raise subprocess.CalledProcessError(rc, export_cmd) from None
+            raise
+
+        rc = p_out.wait()
+        if rc != 0:
+            raise subprocess.CalledProcessError(rc, export_cmd)
+        raise FileNotFoundError(f"{member_name} not found in exported container")
+
+
+def _untar_export_in_container(export_cmd: list[str], engine: str, volume: str, member_name: str) -> None:
+    untar_cmd = [
+        engine,
+        "run",
+        "--rm",
+        "-i",
+        "--mount",
+        f"type=volume,src={volume},dst=/mnt",
+        "busybox",
+        "tar",
+        "-C",
+        "/mnt",
+        "--strip-components=1",
+        "-x",
+        "-p",
+        "-f",
+        "-",
+        member_name,  # NOTE: double check this
+    ]
+
+    # Connect export and tar through a bare OS pipe, the data moves between the two processes in the kernel
+    # and the parent drops each end as soon as the child holding it has started. A larger pipe only speeds
+    # up the bulk copy, the overall time is still bound by reading and writing the model on disk.
+    read_fd, write_fd = os.pipe()
+    try:
+        _set_pipe_size(write_fd)
+        p_out = subprocess.Popen(export_cmd, stdout=write_fd)
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    with p_out:
+        try:
+            p_in = subprocess.Popen(untar_cmd, stdin=read_fd)
+        finally:
+            os.close(read_fd)
+        with p_in:
+            rc_in = p_in.wait()
+            rc_out = p_out.wait()
+            if rc_in != 0 or rc_out != 0:
+                raise subprocess.CalledProcessError(rc_in or rc_out, untar_cmd if rc_in else export_cmd)
+
+
+@lru_cache(maxsize=128)
+def _vol_hash(model_id: str) -> str:
+    """Short, stable suffix naming the volume and source container for a model image."""
+    return _sha256(model_id.encode()).hexdigest()[:12]
+
+
 def populate_volume_from_image(model: Transport, args: Namespace, output_filename: str, src_model_dir: str = "models"):
     """Builds a Docker-compatible mount string that mirrors Podman image mounts for model assets.
 
     This function requires the model
     """
 
-    vol_hash = hashlib.sha256(model.model.encode()).hexdigest()[:12]
+    vol_hash = _vol_hash(model.model)
     volume = f"ramalama-models-{vol_hash}"
     src = f"src-{vol_hash}"
 
@@ -201,34 +385,15 @@ def populate_volume_from_image(model: Transport, args: Namespace, output_filenam
     try:
         # Stream whole rootfs -> extract only models/<basename>
         export_cmd = [args.engine, "export", src]
-        untar_cmd = [
-            args.engine,
-            "run",
-            "--rm",
-            "-i",
-            "--mount",
-            f"type=volume,src={volume},dst=/mnt",
-            "busybox",
-            "tar",
-            "-C",
-            "/mnt",
-            "--strip-components=1",
-            "-x",
-            "-p",
-            "-f",
-            "-",
-            f"{src_model_dir}/{output_filename}",  # NOTE: double check this
-        ]
-
-        with (
-            subprocess.Popen(export_cmd, stdout=subprocess.PIPE) as p_out,
-            subprocess.Popen(untar_cmd, stdin=p_out.stdout) as p_in,
-        ):
-            p_out.stdout.close()  # type: ignore
-            rc_in = p_in.wait()
-            rc_out = p_out.wait()
-            if rc_in != 0 or rc_out != 0:
-                raise subprocess.CalledProcessError(rc_in or rc_out, untar_cmd if rc_in else export_cmd)
+        member_name = f"{src_model_dir}/{output_filename}"
+
+        # Extract on the host when the volume is reachable, avoiding a helper container,
+        # otherwise untar from inside a container that mounts the volume.
+        mountpoint = _volume_mountpoint(args.engine, volume)
+        if mountpoint is not None:
+            _extract_from_export(export_cmd, member_name, mountpoint)
+        else:
+            _untar_export_in_container(export_cmd, args.engine, volume, member_name)
     finally:
         run_cmd([args.engine, "rm", "-f", src], ignore_stderr=True)
 
@@ -245,65 +410,169 @@ def generate_sha256_binary(to_hash: bytes, with_sha_prefix: bool = True) -> str:
     Returns:
     str: Hex digest of the input appended to the prefix sha256-
     """
-    h = hashlib.new("sha256")
-    h.update(to_hash)
+    digest = _sha256(to_hash).hexdigest()
     if with_sha_prefix:
-        return f"sha256-{h.hexdigest()}"
-    return h.hexdigest()
+        return f"sha256-{digest}"
+    return digest
 
 
 def generate_sha256(to_hash: str, with_sha_prefix: bool = True) -> str:
     return generate_sha256_binary(to_hash.encode("utf-8"), with_sha_prefix)
 
 
+def _checksum_hasher(algorithm: str) -> Callable[..., Any]:
+    """Returns the hash constructor for a checksum prefix, blake3 and xxh3 need their optional packages."""
+    try:
+        if algorithm == "blake3":
+            from blake3 import blake3  # type: ignore
+
+            # BLAKE3 is a tree hash, let it spread large inputs over all cores
+            return partial(blake3, max_threads=blake3.AUTO)
+        if algorithm == "xxh3":
+            from xxhash import xxh3_64  # type: ignore
+
+            return xxh3_64
+    except ImportError:
+        package = "blake3" if algorithm == "blake3" else "xxhash"
+        raise ValueError(f"verifying {algorithm} checksums requires the '{package}' package") from None
+
+    return _sha256
+
+
+def _file_digest(f: io.BufferedIOBase, hasher: Callable[..., Any] = _sha256) -> str:
+    """Returns the hex digest of an open binary file or stream, read from its current position."""
+    offset = f.tell()
+    if isinstance(f, io.BufferedReader) and os.fstat(f.fileno()).st_size - offset > CHECKSUM_MMAP_THRESHOLD:
+        try:
+            # Hash straight from the page cache, without copying the file into Python buffers.
+            # The views have to be released before the mapping can be closed.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with view[offset:] as tail:
+                    return hasher(tail).hexdigest()
+        except (OSError, OverflowError, ValueError) as e:
+            # e.g. not enough address space on 32-bit systems
+            logger.debug(f"Failed to mmap {f.name}, reading it instead: {e}")
+
+    if isinstance(f, io.BytesIO):
+        # Already in memory, hash it without copying. hashlib.file_digest would hash the whole buffer
+        # regardless of the position.
+        with f.getbuffer() as buffer, buffer[offset:] as tail:
+            return hasher(tail).hexdigest()
+
+    if sys.version_info >= (3, 11):
+        # Reads and hashes in C without a Python-level loop
+        return hashlib.file_digest(f, hasher).hexdigest()
+
+    file_hash = hasher()
+    # Reuse one buffer instead of allocating a new bytes object per read
+    buf = bytearray(CHECKSUM_BUFFER_SIZE)
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        file_hash.update(view[:n])
+    return file_hash.hexdigest()
+
+
+def verify_checksum_stream(name: str, fp: io.BufferedIOBase) -> bool:
+    """
+    Verifies if the checksum of a binary stream matches the checksum provided in
+    its name, see verify_checksum.
+
+    Args:
+    name (str): The (file)name containing the checksum prefix
+    fp (io.BufferedIOBase): The stream to hash, read from its current position
+
+    Returns:
+    bool: True if the checksum matches, False otherwise.
+    """
+
+    # The name starts with "<algorithm>:" or "<algorithm>-", sanitizing turns the former into the latter
+    # so a single partition extracts the checksum from both
+    fn_base = os.path.basename(name)
+    algorithm, sep, expected_checksum = sanitize_filename(fn_base).partition("-")
+    if not sep or algorithm not in CHECKSUM_DIGEST_LENGTHS:
+        raise ValueError(f"filename has to start with a checksum prefix like 'sha256:' or 'sha256-': {fn_base}")
+
+    if len(expected_checksum) != CHECKSUM_DIGEST_LENGTHS[algorithm]:
+        raise ValueError("invalid checksum length in filename")
+
+    # Calculate the checksum of the contents and compare
+    return _file_digest(fp, _checksum_hasher(algorithm)) == expected_checksum
+
+
+@lru_cache(maxsize=256)
+def _verify_checksum_cached(filename: str, mtime_ns: int, size: int) -> bool:
+    """Checks filename against its checksum prefix, mtime_ns and size only key the cache."""
+    with open(filename, "rb") as f:
+        return verify_checksum_stream(filename, f)
+
+
 def verify_checksum(filename: str) -> bool:
     """
-    Verifies if the SHA-256 checksum of a file matches the checksum provided in
+    Verifies if the checksum of a file matches the checksum provided in
     the filename.
 
+    Registry digests are SHA-256, locally named files may also use the faster
+    BLAKE3 or XXH3 hashes when the blake3 or xxhash packages are installed.
+
+    Matching results are cached by path, modification time and size, so an
+    unchanged file is only hashed once. verify_checksum.cache_clear() resets
+    the cache.
+
     Args:
     filename (str): The filename containing the checksum prefix
-                    (e.g., "sha256:<checksum>")
+                    (e.g., "sha256:<checksum>", "blake3-<checksum>" or "xxh3-<checksum>")
 
     Returns:
     bool: True if the checksum matches, False otherwise.
     """
 
-    if not os.path.exists(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:
         return False
 
-    # Check if the filename starts with "sha256:" or "sha256-" and extract the checksum from filename
-    expected_checksum = ""
-    fn_base = os.path.basename(filename)
-    if fn_base.startswith("sha256:"):
-        expected_checksum = fn_base.split(":")[1]
-    elif fn_base.startswith("sha256-"):
-        expected_checksum = fn_base.split("-")[1]
-    else:
-        raise ValueError(f"filename has to start with 'sha256:' or 'sha256-': {fn_base}")
+    if _verify_checksum_cached(filename, st.st_mtime_ns, st.st_size):
+        return True
 
-    if len(expected_checksum) != 64:
-        raise ValueError("invalid checksum length in filename")
+    # Mismatching blobs are usually re-downloaded right away, and the new file can end up with the same size and,
+    # within the filesystem's timestamp granularity, the same mtime. Never answer those from the cache.
+    _verify_checksum_cached.cache_clear()
+    return False
 
-    # Calculate the SHA-256 checksum of the file contents
-    sha256_hash = hashlib.sha256()
-    with open(filename, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
 
-    # Compare the checksums
-    return sha256_hash.hexdigest() == expected_checksum
+verify_checksum.cache_clear = _verify_checksum_cached.cache_clear  # type: ignore[attr-defined]
+
+
+def verify_checksums(filenames: Sequence[str]) -> list[bool]:
+    """
+    Verifies the checksums of several files concurrently, see verify_checksum.
+    The hashing releases the GIL, so the files are hashed in parallel.
+
+    Args:
+    filenames (Sequence[str]): The filenames containing the checksum prefix
+
+    Returns:
+    list[bool]: For each filename, True if the checksum matches, False otherwise.
+    """
+    if len(filenames) <= 1:
+        return [verify_checksum(filename) for filename in filenames]
+
+    with ThreadPoolExecutor(max_workers=min(len(filenames), os.cpu_count() or 1)) as executor:
+        return list(executor.map(verify_checksum, filenames))
 
 
 def genname():
-    return "ramalama-" + "".join(random.choices(string.ascii_letters + string.digits, k=10))
+    # 7 random bytes encode to 12 base32 characters, 10 of them keep 50 bits of randomness
+    return "ramalama-" + base64.b32encode(os.urandom(7))[:10].decode("ascii").lower()
 
 
 @lru_cache
 def engine_version(engine: SUPPORTED_ENGINES | Path | str) -> SemVer:
     # Create manifest list for target with imageid
     cmd_args = [str(engine), "version", "--format", "{{ .Client.Version }}"]
-    return SemVer.parse(run_cmd(cmd_args, encoding="utf-8").stdout.strip())
+    return SemVer.parse(run_cmd(cmd_args).stdout.decode("utf-8").strip())
 
 
 class CDI_DEVICE(TypedDict):
@@ -572,22 +841,32 @@ def check_mthreads() -> Optional[Literal["musa"]]:
 AccelType: TypeAlias = Literal["asahi", "cuda", "cann", "hip", "intel", "musa"]
 
 
-@lru_cache(maxsize=1)
-def get_accel() -> AccelType | Literal["none"]:
-    checks: tuple[Callable[[], Optional[AccelType]], ...] = (
-        check_asahi,
-        cast(Callable[[], Optional[Literal['cuda']]], check_nvidia),
-        check_ascend,
-        check_rocm_amd,
-        check_intel,
-        check_mthreads,
-    )
+def _detect_accel(checks: Sequence[Callable[[], Optional[AccelType]]]) -> AccelType | Literal["none"]:
+    """Returns the accelerator reported by the first matching check, in order."""
     for check in checks:
         if result := check():
             return result
     return "none"
 
 
+@lru_cache(maxsize=1)
+def get_accel() -> AccelType | Literal["none"]:
+    # None of the probes below can succeed on macOS, skip spawning the vendor tools
+    if sys.platform == "darwin":
+        return "none"
+
+    return _detect_accel(
+        (
+            check_asahi,
+            cast(Callable[[], Optional[Literal['cuda']]], check_nvidia),
+            check_ascend,
+            check_rocm_amd,
+            check_intel,
+            check_mthreads,
+        )
+    )
+
+
 def set_accel_env_vars():
     if get_accel_env_vars():
         return
@@ -611,6 +890,7 @@ GPUEnvVar: TypeAlias = Literal[
     "INTEL_VISIBLE_DEVICES",
     "MUSA_VISIBLE_DEVICES",
 ]
+_GPU_ENV_VARS: tuple[GPUEnvVar, ...] = get_args(GPUEnvVar)
 
 
 def get_gpu_devices():
@@ -623,7 +903,7 @@ def get_gpu_devices():
 
 
 def get_gpu_type_env_vars() -> dict[GPUEnvVar, str]:
-    return {k: v for k in get_args(GPUEnvVar) if (v := os.environ.get(k))}
+    return {k: v for k in _GPU_ENV_VARS if (v := os.environ.get(k))}
 
 
 AccelEnvVar: TypeAlias = Literal[
@@ -632,11 +912,12 @@ AccelEnvVar: TypeAlias = Literal[
     "HSA_OVERRIDE_GFX_VERSION",
     "MTHREADS_VISIBLE_DEVICES",
 ]
+_ACCEL_ENV_VARS: tuple[AccelEnvVar, ...] = get_args(AccelEnvVar)
 
 
 def get_accel_env_vars() -> dict[GPUEnvVar | AccelEnvVar, str]:
     gpu_env_vars: dict[GPUEnvVar, str] = get_gpu_type_env_vars()
-    accel_env_vars: dict[AccelEnvVar, str] = {k: v for k in get_args(AccelEnvVar) if (v := os.environ.get(k))}
+    accel_env_vars: dict[AccelEnvVar, str] = {k: v for k in _ACCEL_ENV_VARS if (v := os.environ.get(k))}
     return gpu_env_vars | accel_env_vars
 
 
@@ -647,6 +928,7 @@ def rm_until_substring(input: str, substring: str) -> str:
     return input[pos + len(substring) :]
 
 
+@lru_cache(maxsize=1)
 def minor_release() -> str:
     version_split = version().split(".")
     vers = ".".join(version_split[:2])
@@ -656,13 +938,14 @@ def minor_release() -> str:
 
 
 def version_tagged_image(image: str) -> str:
-    if len(image.split(":")) > 1:
+    # Only the last path component can carry a tag, a ':' before it belongs to a registry port
+    if ":" in image.rsplit("/", 1)[-1]:
         return image
     return f"{image}:{minor_release()}"
 
 
 def latest_tagged_image(image: str) -> str:
-    if len(image.split(":")) > 1:
+    if ":" in image.rsplit("/", 1)[-1]:
         return image
     return f"{image}:latest"
 
@@ -761,8 +1044,16 @@ def ensure_image(conman: Optional[str], image: str, should_pull: bool = False) -
 
 
 class ContainerEntryPoint(str):
-    def __init__(self, entrypoint: Optional[str] = None):
-        self.entrypoint = entrypoint
+    # str subclasses only support empty __slots__, so the entrypoint is kept as the string value itself
+    # and an empty one is the same as None
+    __slots__ = ()
+
+    def __new__(cls, entrypoint: Optional[str] = None):
+        return str.__new__(cls, entrypoint or "")
+
+    @property
+    def entrypoint(self) -> Optional[str]:
+        return str.__str__(self) or None
 
     def __str__(self):
         return str(self.entrypoint)
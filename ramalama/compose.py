@@ -2,6 +2,7 @@ from __future__ import annotations
 
 # ramalama/generate/compose.py
 import os
+import re
 import shlex
 from typing import Optional
 
@@ -9,6 +10,18 @@ from ramalama.common import RAG_DIR, get_accel_env_vars, get_gpu_devices
 from ramalama.file import PlainFile
 from ramalama.version import version
 
+_GPU_IMAGE_RE = re.compile(r"cuda|rocm|gpu", re.IGNORECASE)
+_GPU_DEPLOY_BLOCK = """\
+    deploy:
+      resources:
+        reservations:
+          devices:
+            - driver: nvidia
+              count: all
+              capabilities: [gpu]"""
+# Same character class shlex.quote() uses to decide whether a token needs quoting
+_find_unsafe = re.compile(r"[^\w@%+=:,./-]", re.ASCII).search
+
 
 class Compose:
     def __init__(
@@ -20,12 +33,12 @@ class Compose:
         args,
         exec_args,
     ):
-        self.src_model_path, self.dest_model_path = model_paths
+        src_model_path, self.dest_model_path = model_paths
+        self.src_model_path = src_model_path.removeprefix("oci://")
         self.src_chat_template_path, self.dest_chat_template_path = (
             chat_template_paths if chat_template_paths is not None else ("", "")
         )
         self.src_mmproj_path, self.dest_mmproj_path = mmproj_paths if mmproj_paths is not None else ("", "")
-        self.src_model_path = self.src_model_path.removeprefix("oci://")
 
         self.model_name = model_name
         custom_name = getattr(args, "name", None)
@@ -35,24 +48,24 @@ class Compose:
         self.image = args.image
 
     def _gen_volumes(self) -> str:
-        volumes = "    volumes:"
+        volumes = ["    volumes:"]
 
         # Model Volume
-        volumes += self._gen_model_volume()
+        volumes.append(self._gen_model_volume())
 
         # RAG Volume
         if getattr(self.args, "rag", None):
-            volumes += self._gen_rag_volume()
+            volumes.append(self._gen_rag_volume())
 
         # Chat Template Volume
         if self.src_chat_template_path and os.path.exists(self.src_chat_template_path):
-            volumes += self._gen_chat_template_volume()
+            volumes.append(self._gen_chat_template_volume())
 
         # MMProj Volume
         if self.src_mmproj_path and os.path.exists(self.src_mmproj_path):
-            volumes += self._gen_mmproj_volume()
+            volumes.append(self._gen_mmproj_volume())
 
-        return volumes
+        return "".join(volumes)
 
     def _gen_model_volume(self) -> str:
         return f'\n      - "{self.src_model_path}:{self.dest_model_path}:ro"'
@@ -92,10 +105,7 @@ class Compose:
         if not devices:
             return ""
 
-        devices_str = "    devices:"
-        for dev in devices.values():
-            devices_str += f'\n      - "{dev}:{dev}"'
-        return devices_str
+        return "    devices:\n" + "\n".join(f'      - "{dev}:{dev}"' for dev in devices.values())
 
     def _gen_ports(self) -> str:
         port_arg = getattr(self.args, "port", None)
@@ -119,30 +129,24 @@ class Compose:
         if not env_vars:
             return ""
 
-        env_spec = "    environment:"
-        for k, v in env_vars.items():
-            env_spec += f'\n      - {k}={v}'
-        return env_spec
+        return "    environment:\n" + "\n".join(f"      - {k}={v}" for k, v in env_vars.items())
 
-    def _gen_gpu_deployment(self) -> str:
-        gpu_keywords = ["cuda", "rocm", "gpu"]
-        if not any(keyword in self.image.lower() for keyword in gpu_keywords):
-            return ""
+    def _needs_gpu(self) -> bool:
+        kinds = {m.lower() for m in _GPU_IMAGE_RE.findall(self.image)}
+        # ROCm GPUs are passed through as /dev/kfd and /dev/dri devices, only NVIDIA needs a reservation
+        return bool(kinds) and "rocm" not in kinds
 
-        return """\
-    deploy:
-      resources:
-        reservations:
-          devices:
-            - driver: nvidia
-              count: all
-              capabilities: [gpu]"""
+    def _gen_gpu_deployment(self) -> str:
+        return _GPU_DEPLOY_BLOCK if self._needs_gpu() else ""
 
     def _gen_command(self) -> str:
         if not self.exec_args:
             return ""
-        # shlex.join is perfect for creating a command string from a list
-        cmd = shlex.join(self.exec_args)
+        # Arguments rarely need quoting, only fall back to shlex.join when one does
+        if all(arg and not _find_unsafe(arg) for arg in self.exec_args):
+            cmd = " ".join(self.exec_args)
+        else:
+            cmd = shlex.join(self.exec_args)
         return f"    command: {cmd}"
 
     def generate(self) -> PlainFile:
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import tempfile
 import urllib.request
 from abc import ABC, abstractmethod
@@ -100,7 +99,7 @@ class HFStyleRepository(ABC):
         assert self.model_filename
         if is_split_file_model(self.model_filename):
             # If the model is split, we need to add all parts
-            match = re.match(SPLIT_MODEL_PATH_RE, self.model_filename)
+            match = SPLIT_MODEL_PATH_RE.match(self.model_filename)
             if match:
                 path_part = match[1]
                 if path_part:
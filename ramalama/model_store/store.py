@@ -8,7 +8,7 @@ from http import HTTPStatus
 from pathlib import Path
 from typing import Optional, Sequence, Tuple
 
-from ramalama.common import perror, sanitize_filename, verify_checksum
+from ramalama.common import perror, sanitize_filename, verify_checksum, verify_checksums
 from ramalama.endian import EndianMismatchError, get_system_endianness
 from ramalama.logger import logger
 from ramalama.model_inspect.gguf_parser import GGUFInfoParser, GGUFModelInfo
@@ -221,6 +221,7 @@ class ModelStore:
     def _download_snapshot_files(
         self, ref_file: RefJSONFile, snapshot_hash: str, snapshot_files: Sequence[SnapshotFile]
     ):
+        downloaded_files: list[SnapshotFile] = []
         for file in snapshot_files:
             dest_path = self.get_blob_file_path(file.hash)
             try:
@@ -232,15 +233,20 @@ class ModelStore:
                 if ex.code == HTTPStatus.NOT_FOUND:
                     ref_file.remove_file(file.hash)
                 continue
-
-            if file.should_verify_checksum:
+            downloaded_files.append(file)
+
+        # Verify all downloaded blobs at once so that e.g. the shards of a split model are hashed in parallel
+        files_to_verify = [file for file in downloaded_files if file.should_verify_checksum]
+        blob_paths = [self.get_blob_file_path(file.hash) for file in files_to_verify]
+        for file, dest_path, is_valid in zip(files_to_verify, blob_paths, verify_checksums(blob_paths)):
+            if not is_valid:
+                logger.info(f"Checksum mismatch for blob {dest_path}, retrying download ...")
+                os.remove(dest_path)
+                file.download(dest_path, self.get_snapshot_directory(snapshot_hash))
                 if not verify_checksum(dest_path):
-                    logger.info(f"Checksum mismatch for blob {dest_path}, retrying download ...")
-                    os.remove(dest_path)
-                    file.download(dest_path, self.get_snapshot_directory(snapshot_hash))
-                    if not verify_checksum(dest_path):
-                        raise ValueError(f"Checksum verification failed for blob {dest_path}")
+                    raise ValueError(f"Checksum verification failed for blob {dest_path}")
 
+        for file in downloaded_files:
             link_path = self.get_snapshot_file_path(snapshot_hash, file.name)
 
             blob_absolute_path = self.get_blob_file_path(file.hash)
@@ -91,13 +91,14 @@ class BaseImageStrategy(BaseOCIStrategy[Literal['image']]):
         if cmd_args is None:
             cmd_args = []
 
+        # Most references are plain images, only try removing a manifest list when that fails
         try:
-            run_cmd([self.engine, "manifest", "rm", str(ref)], ignore_stderr=True)
+            run_cmd([self.engine, "image", "rm", *cmd_args, str(ref)], ignore_stderr=True)
             return True
         except Exception:
             pass
         try:
-            run_cmd([self.engine, "image", "rm", *cmd_args, str(ref)], ignore_stderr=True)
+            run_cmd([self.engine, "manifest", "rm", str(ref)], ignore_stderr=True)
             return True
         except Exception:
             return False
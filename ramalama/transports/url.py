@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import re
 import shutil
 from pathlib import Path
 
@@ -96,7 +95,7 @@ class URL(Transport):
         files: list[SnapshotFile] = []
 
         # model is split, lets fetch all files based on the name pattern
-        match = re.match(SPLIT_MODEL_PATH_RE, self.model)
+        match = SPLIT_MODEL_PATH_RE.match(self.model)
         if match is None:
             return files
 
@@ -57,6 +57,36 @@ def test_docker_image_path(monkeypatch):
     assert strat.mount_arg(ref).startswith("--mount=type=volume")
 
 
+def test_image_remove_single_command(monkeypatch):
+    rec = Recorder()
+    monkeypatch.setattr(strategies, "run_cmd", rec)
+    strat = strategies.PodmanImageStrategy(engine="podman", model_store=Mock())
+    ref = OciRef.from_ref_string("image:latest")
+    assert strat.remove(ref, cmd_args=["--force=True"]) is True
+    assert [call[0] for call in rec.calls] == [["podman", "image", "rm", "--force=True", str(ref)]]
+
+
+def test_image_remove_falls_back_to_manifest(monkeypatch):
+    calls = []
+
+    def fake_run_cmd(args, **kwargs):
+        calls.append(args)
+        if args[1] == "image":
+            raise RuntimeError("image is a manifest list")
+
+    monkeypatch.setattr(strategies, "run_cmd", fake_run_cmd)
+    strat = strategies.PodmanImageStrategy(engine="podman", model_store=Mock())
+    ref = OciRef.from_ref_string("image:latest")
+    assert strat.remove(ref) is True
+    assert calls == [["podman", "image", "rm", str(ref)], ["podman", "manifest", "rm", str(ref)]]
+
+
+def test_image_remove_failure(monkeypatch):
+    monkeypatch.setattr(strategies, "run_cmd", Recorder(should_fail=True))
+    strat = strategies.DockerImageStrategy(engine="docker", model_store=Mock())
+    assert strat.remove(OciRef.from_ref_string("image:latest")) is False
+
+
 def test_http_bind_path_fetch_and_exists(monkeypatch):
     called = []
 
@@ -1,8 +1,12 @@
+import io
+import mmap
 import os
-import shutil
+import re
 import subprocess
+import sys
+import tarfile
 from contextlib import ExitStack
-from pathlib import Path
+from importlib.util import find_spec
 from sys import platform
 from typing import Optional
 from unittest.mock import MagicMock, Mock, mock_open, patch
@@ -16,17 +20,40 @@ from ramalama.cli import (
     parse_args_from_cmd,
 )
 from ramalama.common import (
+    PIPE_BUFFER_SIZE,
+    ContainerEntryPoint,
     _check_intel_windows,
+    _detect_accel,
+    _file_digest,
+    _list_podman_machines,
+    _set_pipe_size,
+    _volume_mountpoint,
     accel_image,
+    apple_vm,
+    available,
+    check_asahi,
+    check_ascend,
     check_intel,
+    check_mthreads,
     check_nvidia,
+    check_rocm_amd,
     ensure_image,
     find_in_cdi,
+    generate_sha256,
+    genname,
     get_accel,
+    latest_tagged_image,
     load_cdi_config,
+    minor_release,
     populate_volume_from_image,
+    quoted,
     rm_until_substring,
+    run_cmd,
+    sanitize_filename,
     verify_checksum,
+    verify_checksum_stream,
+    verify_checksums,
+    version_tagged_image,
 )
 from ramalama.compat import NamedTemporaryFile
 from ramalama.config import DEFAULT_IMAGE, load_config
@@ -72,40 +99,194 @@ I have been tampered with
 
 """  # noqa: E501
 
+# Known digests of valid_input, tampered_input is checked against a digest it does not match
+VALID_INPUT_SHA256 = "62fbfd9ed093d6e5ac83190c86eec5369317919f4b149598d2dbb38900e9faef"
+VALID_INPUT_BLAKE3 = "819cc726b2531700b7b34750c2baa95a8e56f1b9b530f0c425c4f7bc7e7b8b04"
+VALID_INPUT_XXH3 = "6906e7dfcdddc037"
+TAMPERED_SHA256 = "16cd1aa2bd52b0e87ff143e8a8a7bb6fcb0163c624396ca58e7f75ec99ef081f"
+
+
+def test_valid_input_digest():
+    assert generate_sha256(valid_input, with_sha_prefix=False) == VALID_INPUT_SHA256
+
 
 @pytest.mark.parametrize(
     "input_file_name,content,expected_error,expected_result",
     [
         ("invalidname", "", ValueError, None),
         ("sha256:123", "RamaLama - make working with AI boring through the use of OCI containers.", ValueError, None),
-        ("sha256:62fbfd9ed093d6e5ac83190c86eec5369317919f4b149598d2dbb38900e9faef", valid_input, None, True),
-        ("sha256-62fbfd9ed093d6e5ac83190c86eec5369317919f4b149598d2dbb38900e9faef", valid_input, None, True),
-        ("sha256:16cd1aa2bd52b0e87ff143e8a8a7bb6fcb0163c624396ca58e7f75ec99ef081f", tampered_input, None, False),
+        (f"sha256:{VALID_INPUT_SHA256}", valid_input, None, True),
+        (f"sha256-{VALID_INPUT_SHA256}", valid_input, None, True),
+        (f"sha256:{TAMPERED_SHA256}", tampered_input, None, False),
+        (f"sha256:{VALID_INPUT_SHA256}-1", valid_input, ValueError, None),
+        ("md5-6c4ee8ab4d4bd2a0b0e4b6c4b3da9e1a", valid_input, ValueError, None),
+        ("xxh3-123", valid_input, ValueError, None),
+        pytest.param(
+            f"blake3-{VALID_INPUT_BLAKE3}",
+            valid_input,
+            None,
+            True,
+            marks=pytest.mark.skipif(find_spec("blake3") is None, reason="blake3 is not installed"),
+        ),
+        pytest.param(
+            f"blake3:{VALID_INPUT_BLAKE3}",
+            tampered_input,
+            None,
+            False,
+            marks=pytest.mark.skipif(find_spec("blake3") is None, reason="blake3 is not installed"),
+        ),
+        pytest.param(
+            f"xxh3-{VALID_INPUT_XXH3}",
+            valid_input,
+            None,
+            True,
+            marks=pytest.mark.skipif(find_spec("xxhash") is None, reason="xxhash is not installed"),
+        ),
+        pytest.param(
+            f"xxh3:{VALID_INPUT_XXH3}",
+            tampered_input,
+            None,
+            False,
+            marks=pytest.mark.skipif(find_spec("xxhash") is None, reason="xxhash is not installed"),
+        ),
     ],
 )
+# The stream is hashed from its current position, not from the start of its buffer
+@pytest.mark.parametrize("header", [b"", b"HEADER"])
 def test_verify_checksum(
-    input_file_name: str, content: str, expected_error: Optional[type[Exception]], expected_result: bool
+    input_file_name: str, content: str, expected_error: Optional[type[Exception]], expected_result: bool, header: bytes
 ):
-    # skip this test case on Windows since colon is not a valid file symbol
-    if ":" in input_file_name and platform == "win32":
+    fp = io.BytesIO(header + content.encode())
+    fp.seek(len(header))
+
+    if expected_error is None:
+        assert verify_checksum_stream(input_file_name, fp) == expected_result
         return
 
-    full_dir_path = os.path.join(Path(__file__).parent, "verify_checksum")
-    file_path = os.path.join(full_dir_path, input_file_name)
+    with pytest.raises(expected_error):
+        verify_checksum_stream(input_file_name, fp)
 
-    try:
-        os.makedirs(full_dir_path, exist_ok=True)
-        with open(file_path, "w") as f:
-            f.write(content)
 
-        if expected_error is None:
-            assert verify_checksum(file_path) == expected_result
-            return
+def test_verify_checksum_missing_file(tmp_path):
+    file_path = tmp_path / f"sha256-{VALID_INPUT_SHA256}"
+    assert verify_checksum(str(file_path)) is False
+
+
+def test_verify_checksum_cached(tmp_path):
+    file_path = tmp_path / f"sha256-{VALID_INPUT_SHA256}"
+    file_path.write_text(valid_input)
+    verify_checksum.cache_clear()
+
+    with patch("ramalama.common._file_digest", wraps=_file_digest) as mock_digest:
+        assert verify_checksum(str(file_path)) is True
+        assert verify_checksum(str(file_path)) is True
+        mock_digest.assert_called_once()
+
+        # A modified file is hashed again
+        file_path.write_text(tampered_input)
+        assert verify_checksum(str(file_path)) is False
+        assert mock_digest.call_count == 2
+
+        verify_checksum.cache_clear()
+        assert verify_checksum(str(file_path)) is False
+        assert mock_digest.call_count == 3
 
-        with pytest.raises(expected_error):
-            verify_checksum(file_path)
-    finally:
-        shutil.rmtree(full_dir_path)
+
+def test_verify_checksum_does_not_cache_mismatches(tmp_path):
+    file_path = tmp_path / f"sha256-{VALID_INPUT_SHA256}"
+    file_path.write_bytes(valid_input.encode()[::-1])
+    st = os.stat(file_path)
+    verify_checksum.cache_clear()
+
+    assert verify_checksum(str(file_path)) is False
+
+    # Re-download with the same size and mtime, as happens within the timestamp granularity of the filesystem
+    file_path.write_text(valid_input)
+    os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert verify_checksum(str(file_path)) is True
+
+
+@pytest.mark.parametrize(
+    "module,file_name",
+    [
+        ("blake3", f"blake3-{VALID_INPUT_BLAKE3}"),
+        ("xxhash", f"xxh3-{VALID_INPUT_XXH3}"),
+    ],
+)
+def test_verify_checksum_missing_hash_package(tmp_path, module, file_name):
+    file_path = tmp_path / file_name
+    file_path.write_text(valid_input)
+
+    with patch.dict(sys.modules, {module: None}), pytest.raises(ValueError, match=f"requires the '{module}' package"):
+        verify_checksum(str(file_path))
+
+
+@pytest.mark.parametrize("mmap_error", [None, OSError("cannot allocate memory")])
+def test_verify_checksum_mmap(tmp_path, mmap_error):
+    file_path = tmp_path / f"sha256-{VALID_INPUT_SHA256}"
+    file_path.write_text(valid_input)
+
+    with (
+        patch("ramalama.common.CHECKSUM_MMAP_THRESHOLD", 0),
+        patch("ramalama.common.mmap.mmap", side_effect=mmap_error, wraps=mmap.mmap) as mock_mmap,
+    ):
+        assert verify_checksum(str(file_path)) is True
+        mock_mmap.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    [
+        "sha256-254bcc3fc4f27172636df4bf32de9f107f620d559b20d760197e452b97453917",
+        pytest.param(
+            "blake3-e66d34ca5a36dfa692903a66d66fd1d9c87bd553c32fbf7d3960542f4cda3257",
+            marks=pytest.mark.skipif(find_spec("blake3") is None, reason="blake3 is not installed"),
+        ),
+    ],
+)
+def test_verify_checksum_large_sparse_file(tmp_path, file_name):
+    file_path = tmp_path / file_name
+    with open(file_path, "wb") as f:
+        f.truncate(128 << 20)
+
+    with patch("ramalama.common.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+        assert verify_checksum(str(file_path)) is True
+        mock_mmap.assert_called_once()
+
+
+@pytest.mark.parametrize("mmap_error", [None, OSError("cannot allocate memory")])
+def test_verify_checksum_stream_seeked_large_file(tmp_path, mmap_error):
+    # A 10 byte header followed by 9MiB of zeros, only the zeros are hashed
+    file_path = tmp_path / "model.bin"
+    with open(file_path, "wb") as f:
+        f.write(b"0123456789")
+        f.truncate(10 + (9 << 20))
+
+    name = "sha256-d2ee4703cd9698945ca7b9fe1689ea3095597eac1a0afd8dba00cac7894fdc43"
+    with (
+        open(file_path, "rb") as f,
+        patch("ramalama.common.mmap.mmap", side_effect=mmap_error, wraps=mmap.mmap) as mock_mmap,
+    ):
+        f.seek(10)
+        assert verify_checksum_stream(name, f) is True
+        mock_mmap.assert_called_once()
+
+
+def test_verify_checksums(tmp_path):
+    valid_path = tmp_path / f"sha256-{VALID_INPUT_SHA256}"
+    valid_path.write_text(valid_input)
+    tampered_path = tmp_path / f"sha256-{TAMPERED_SHA256}"
+    tampered_path.write_text(tampered_input)
+    missing_path = tmp_path / "sha256-0000000000000000000000000000000000000000000000000000000000000000"
+
+    assert verify_checksums([]) == []
+    assert verify_checksums([str(valid_path)]) == [True]
+    assert verify_checksums([str(valid_path), str(tampered_path), str(missing_path), str(valid_path)]) == [
+        True,
+        False,
+        False,
+        True,
+    ]
 
 
 _BASE_IMAGE = "quay.io/ramalama/ramalama"
@@ -171,33 +352,60 @@ image = "{config_override}"
                 assert accel_image(config) == expected_result
 
 
+@pytest.fixture
+def clear_podman_machines_cache():
+    _list_podman_machines.cache_clear()
+    yield
+    _list_podman_machines.cache_clear()
+
+
 @patch("ramalama.common.run_cmd")
 @patch("ramalama.common.handle_provider")
-def test_apple_vm_returns_result(mock_handle_provider, mock_run_cmd):
+def test_apple_vm_returns_result(mock_handle_provider, mock_run_cmd, clear_podman_machines_cache):
     mock_run_cmd.return_value.stdout = b'[{"Name": "myvm"}]'
     mock_handle_provider.return_value = True
     config = object()
-    from ramalama.common import apple_vm
-
     result = apple_vm("podman", config)
 
     assert result is True
     mock_run_cmd.assert_called_once_with(
-        ["podman", "machine", "list", "--format", "json", "--all-providers"], ignore_stderr=True, encoding="utf-8"
+        ["podman", "machine", "list", "--format", "json", "--all-providers"], ignore_stderr=True
     )
     mock_handle_provider.assert_called_once_with({"Name": "myvm"}, config)
 
 
 @patch("ramalama.common.run_cmd", side_effect=FileNotFoundError("podman: command not found"))
-def test_apple_vm_returns_false_when_podman_not_installed(mock_run_cmd):
-    from ramalama.common import apple_vm
-
+def test_apple_vm_returns_false_when_podman_not_installed(mock_run_cmd, clear_podman_machines_cache):
     result = apple_vm("podman", None)
 
     assert result is False
     mock_run_cmd.assert_called_once()
 
 
+@patch("ramalama.common.run_cmd")
+@patch("ramalama.common.handle_provider", return_value=None)
+def test_apple_vm_lists_machines_once(mock_handle_provider, mock_run_cmd, clear_podman_machines_cache):
+    mock_run_cmd.return_value.stdout = b'[{"Name": "myvm"}]'
+    assert apple_vm("podman", None) is False
+    assert apple_vm("podman", None) is False
+
+    mock_run_cmd.assert_called_once()
+    assert mock_handle_provider.call_count == 2
+
+
+@pytest.mark.parametrize("orjson_module", [None, "orjson"])
+@pytest.mark.parametrize("stdout,expected", [(b'[{"Name": "myvm"}]', True), (b"not json", False)])
+@patch("ramalama.common.run_cmd")
+@patch("ramalama.common.handle_provider", return_value=True)
+def test_apple_vm_json_parsers(_, mock_run_cmd, stdout, expected, orjson_module, clear_podman_machines_cache):
+    if orjson_module:
+        pytest.importorskip(orjson_module)
+    mock_run_cmd.return_value.stdout = stdout
+
+    with patch.dict(sys.modules, {} if orjson_module else {"orjson": None}):
+        assert apple_vm("podman", None) is expected
+
+
 class TestEnsureImage:
     """Tests for ensure_image()"""
 
@@ -342,21 +550,34 @@ class TestGetAccel:
     def setup_method(self):
         get_accel.cache_clear()
 
-    @pytest.mark.parametrize("accel,expected", accels)
-    def test_get_accel(self, accel, expected):  # sourcery skip: no-loop-in-tests
-        with ExitStack() as stack:
-            for other_accel, _ in self.accels:
-                return_value = expected if other_accel == accel else None
-                stack.enter_context(patch(f"ramalama.common.{other_accel}", return_value=return_value))
-            returned_accel = get_accel()
-            assert returned_accel == expected
+    @pytest.mark.parametrize("accel,expected", [*accels, (None, "none")])
+    def test_detect_accel(self, accel, expected):
+        checks = [(lambda result=expected if name == accel else None: result) for name, _ in self.accels]
+        assert _detect_accel(checks) == expected
+
+    def test_detect_accel_stops_at_first_match(self):
+        def unreachable():
+            raise AssertionError("probed after a match")
 
-    def test_default_get_accel(self):  # sourcery skip: no-loop-in-tests
+        assert _detect_accel([lambda: None, lambda: "cuda", unreachable]) == "cuda"
+
+    @patch("ramalama.common.sys.platform", "linux")
+    @patch("ramalama.common._detect_accel", return_value="cuda")
+    def test_get_accel(self, mock_detect_accel):
+        assert get_accel() == "cuda"
+        assert get_accel() == "cuda"
+
+        mock_detect_accel.assert_called_once_with(
+            (check_asahi, check_nvidia, check_ascend, check_rocm_amd, check_intel, check_mthreads)
+        )
+
+    @patch("ramalama.common.sys.platform", "darwin")
+    def test_get_accel_darwin(self):  # sourcery skip: no-loop-in-tests
         with ExitStack() as stack:
-            for other_accel, _ in self.accels:
-                stack.enter_context(patch(f"ramalama.common.{other_accel}", return_value=None))
-            returned_accel = get_accel()
-            assert returned_accel == "none"
+            mocks = [stack.enter_context(patch(f"ramalama.common.{accel}")) for accel, _ in self.accels]
+            assert get_accel() == "none"
+            for mock in mocks:
+                mock.assert_not_called()
 
 
 CDI_GPU_UUID = "GPU-08b3c2e8-cb7b-ea3f-7711-a042c580b3e8"
@@ -587,9 +808,41 @@ def test_find_in_cdi_no_config(mock_load_cdi_config):
     assert find_in_cdi(["all"]) == ([], ["all"])
 
 
+class FakeProc:
+    """Stand-in for a subprocess.Popen object, much cheaper than a MagicMock"""
+
+    def __init__(self, returncode: int = 0, stdout: Optional[io.BytesIO] = None):
+        self.returncode = returncode
+        self.stdout = stdout if stdout is not None else io.BytesIO()
+        self.killed = False
+
+    def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        self.killed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+
 class TestPopulateVolumeFromImage:
     """Test the populate_volume_from_image function for Docker volume creation"""
 
+    @pytest.fixture(autouse=True)
+    def mock_set_pipe_size(self):
+        with patch("ramalama.common._set_pipe_size") as mock_set_pipe_size:
+            yield mock_set_pipe_size
+
+    @pytest.fixture(autouse=True)
+    def mock_volume_mountpoint(self):
+        # Volume not reachable from the host unless a test says otherwise
+        with patch("ramalama.common._volume_mountpoint", return_value=None) as mock_volume_mountpoint:
+            yield mock_volume_mountpoint
+
     @pytest.fixture
     def mock_model(self):
         """Create a mock model with required attributes"""
@@ -604,19 +857,8 @@ class TestPopulateVolumeFromImage:
         """Test successful volume population with Docker"""
         output_filename = "model.gguf"
 
-        # Mock the Popen processes for export/tar streaming
-        mock_export_proc = MagicMock()
-        mock_export_proc.stdout = Mock()
-        mock_export_proc.wait.return_value = 0
-        mock_export_proc.__enter__ = Mock(return_value=mock_export_proc)
-        mock_export_proc.__exit__ = Mock(return_value=None)
-
-        mock_tar_proc = MagicMock()
-        mock_tar_proc.wait.return_value = 0
-        mock_tar_proc.__enter__ = Mock(return_value=mock_tar_proc)
-        mock_tar_proc.__exit__ = Mock(return_value=None)
-
-        mock_popen.side_effect = [mock_export_proc, mock_tar_proc]
+        # Fake the Popen processes for export/tar streaming
+        mock_popen.side_effect = [FakeProc(), FakeProc()]
 
         result = populate_volume_from_image(mock_model, Mock(engine="docker"), output_filename)
 
@@ -624,6 +866,10 @@ class TestPopulateVolumeFromImage:
 
         assert mock_run_cmd.call_count >= 3
         assert mock_popen.call_count == 2
+        # export and tar are connected through a bare OS pipe
+        export_call, tar_call = mock_popen.call_args_list
+        assert isinstance(export_call.kwargs["stdout"], int)
+        assert isinstance(tar_call.kwargs["stdin"], int)
 
     @patch('subprocess.Popen')
     @patch('ramalama.common.run_cmd')
@@ -631,19 +877,8 @@ class TestPopulateVolumeFromImage:
         """Test handling of export process failure"""
         output_filename = "model.gguf"
 
-        # Mock export process failure
-        mock_export_proc = MagicMock()
-        mock_export_proc.stdout = Mock()
-        mock_export_proc.wait.return_value = 1  # Failure
-        mock_export_proc.__enter__ = Mock(return_value=mock_export_proc)
-        mock_export_proc.__exit__ = Mock(return_value=None)
-
-        mock_tar_proc = MagicMock()
-        mock_tar_proc.wait.return_value = 0
-        mock_tar_proc.__enter__ = Mock(return_value=mock_tar_proc)
-        mock_tar_proc.__exit__ = Mock(return_value=None)
-
-        mock_popen.side_effect = [mock_export_proc, mock_tar_proc]
+        # Fake export process failure
+        mock_popen.side_effect = [FakeProc(returncode=1), FakeProc()]
 
         with pytest.raises(subprocess.CalledProcessError):
             populate_volume_from_image(mock_model, Mock(engine="docker"), output_filename)
@@ -654,23 +889,70 @@ class TestPopulateVolumeFromImage:
         """Test handling of tar process failure"""
         output_filename = "model.gguf"
 
-        # Mock tar process failure
-        mock_export_proc = MagicMock()
-        mock_export_proc.stdout = Mock()
-        mock_export_proc.wait.return_value = 0
-        mock_export_proc.__enter__ = Mock(return_value=mock_export_proc)
-        mock_export_proc.__exit__ = Mock(return_value=None)
-
-        mock_tar_proc = MagicMock()
-        mock_tar_proc.wait.return_value = 1  # Failure
-        mock_tar_proc.__enter__ = Mock(return_value=mock_tar_proc)
-        mock_tar_proc.__exit__ = Mock(return_value=None)
-
-        mock_popen.side_effect = [mock_export_proc, mock_tar_proc]
+        # Fake tar process failure
+        mock_popen.side_effect = [FakeProc(), FakeProc(returncode=1)]
 
         with pytest.raises(subprocess.CalledProcessError):
             populate_volume_from_image(mock_model, Mock(engine="docker"), output_filename)
 
+    @staticmethod
+    def _export_stream(files: dict[str, bytes]) -> io.BytesIO:
+        stream = io.BytesIO()
+        with tarfile.open(fileobj=stream, mode="w") as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        stream.seek(0)
+        return stream
+
+    @pytest.mark.skipif(not hasattr(tarfile, "data_filter"), reason="tarfile extraction filters are not available")
+    @patch('subprocess.Popen')
+    @patch('ramalama.common.run_cmd')
+    def test_populate_volume_extracts_on_host(self, _, mock_popen, mock_model, mock_volume_mountpoint, tmp_path):
+        """Test that a reachable volume is populated without a helper container"""
+        mock_volume_mountpoint.return_value = str(tmp_path)
+
+        export_proc = FakeProc(
+            stdout=self._export_stream(
+                {"etc/hostname": b"src", "models/model.gguf": b"GGUF", "models/other.gguf": b"other"}
+            )
+        )
+        mock_popen.return_value = export_proc
+
+        populate_volume_from_image(mock_model, Mock(engine="docker"), "model.gguf")
+
+        assert mock_popen.call_count == 1
+        assert sorted(os.listdir(tmp_path)) == ["model.gguf"]
+        assert (tmp_path / "model.gguf").read_bytes() == b"GGUF"
+        assert export_proc.killed
+
+    @patch('subprocess.Popen')
+    @patch('ramalama.common.run_cmd')
+    def test_populate_volume_missing_on_host(self, _, mock_popen, mock_model, mock_volume_mountpoint, tmp_path):
+        """Test that a model file missing from the export is reported"""
+        mock_volume_mountpoint.return_value = str(tmp_path)
+
+        mock_popen.return_value = FakeProc(stdout=self._export_stream({"etc/hostname": b"src"}))
+
+        with pytest.raises(FileNotFoundError):
+            populate_volume_from_image(mock_model, Mock(engine="docker"), "model.gguf")
+
+    @patch('subprocess.Popen')
+    @patch('ramalama.common.run_cmd')
+    def test_populate_volume_export_failure_on_host(self, _, mock_popen, mock_model, mock_volume_mountpoint, tmp_path):
+        """Test that a failed export is reported the same way as in the container fallback"""
+        mock_volume_mountpoint.return_value = str(tmp_path)
+
+        # export exits before writing anything, leaving an empty stream
+        mock_popen.return_value = FakeProc(returncode=125)
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            populate_volume_from_image(mock_model, Mock(engine="docker"), "model.gguf")
+        assert exc_info.value.returncode == 125
+        assert exc_info.value.cmd[:2] == ["docker", "export"]
+        assert os.listdir(tmp_path) == []
+
     def test_volume_name_generation(self, mock_model):
         """Test that volume names are generated consistently based on model hash"""
         import hashlib
@@ -679,12 +961,170 @@ class TestPopulateVolumeFromImage:
         expected_volume = f"ramalama-models-{expected_hash}"
 
         with patch('subprocess.Popen') as mock_popen, patch('ramalama.common.run_cmd'):
-            # Mock successful processes
-            mock_proc = MagicMock()
-            mock_proc.wait.return_value = 0
-            mock_proc.__enter__ = Mock(return_value=mock_proc)
-            mock_proc.__exit__ = Mock(return_value=None)
-            mock_popen.return_value = mock_proc
+            # Fake successful processes
+            mock_popen.side_effect = [FakeProc(), FakeProc()]
 
             result = populate_volume_from_image(mock_model, Mock(engine="docker"), "test.gguf")
             assert result == expected_volume
+
+
+@pytest.fixture
+def local_docker_env(tmp_path, monkeypatch):
+    for var in ("DOCKER_HOST", "CONTAINER_HOST", "DOCKER_CONTEXT"):
+        monkeypatch.delenv(var, raising=False)
+    config_dir = tmp_path / "docker-config"
+    config_dir.mkdir()
+    monkeypatch.setenv("DOCKER_CONFIG", str(config_dir))
+    monkeypatch.setattr("ramalama.common.platform.system", lambda: "Linux")
+    return config_dir
+
+
+@patch("ramalama.common.run_cmd")
+def test_volume_mountpoint(mock_run_cmd, tmp_path, local_docker_env):
+    (local_docker_env / "config.json").write_text('{"currentContext": "default"}')
+    mock_run_cmd.return_value.stdout = f"{tmp_path}\n"
+    assert _volume_mountpoint("docker", "vol") == str(tmp_path)
+
+    mock_run_cmd.return_value.stdout = "/nonexistent/volume\n"
+    assert _volume_mountpoint("docker", "vol") is None
+
+
+@pytest.mark.parametrize(
+    "env,config,system",
+    [
+        ({"DOCKER_HOST": "ssh://user@remote"}, None, "Linux"),
+        ({"CONTAINER_HOST": "tcp://remote:2375"}, None, "Linux"),
+        ({"DOCKER_CONTEXT": "remote"}, None, "Linux"),
+        ({}, '{"currentContext": "desktop-linux"}', "Linux"),
+        ({}, None, "Darwin"),
+    ],
+)
+@patch("ramalama.common.run_cmd")
+def test_volume_mountpoint_non_local_daemon(mock_run_cmd, env, config, system, tmp_path, local_docker_env, monkeypatch):
+    # A mountpoint reported by a remote or VM-hosted daemon may exist here as well, it must not be written to
+    for var, value in env.items():
+        monkeypatch.setenv(var, value)
+    if config is not None:
+        (local_docker_env / "config.json").write_text(config)
+    monkeypatch.setattr("ramalama.common.platform.system", lambda: system)
+    mock_run_cmd.return_value.stdout = f"{tmp_path}\n"
+
+    assert _volume_mountpoint("docker", "vol") is None
+    mock_run_cmd.assert_not_called()
+
+
+@patch("ramalama.common.run_cmd")
+def test_volume_mountpoint_without_tar_filters(mock_run_cmd, tmp_path, local_docker_env, monkeypatch):
+    # Host extraction would be unsafe without tarfile's "data" filter, the container fallback must be used
+    monkeypatch.delattr(tarfile, "data_filter", raising=False)
+    mock_run_cmd.return_value.stdout = f"{tmp_path}\n"
+
+    assert _volume_mountpoint("docker", "vol") is None
+    mock_run_cmd.assert_not_called()
+
+
+@pytest.mark.skipif(platform != "linux", reason="pipe buffer sizes can only be changed on Linux")
+def test_set_pipe_size():
+    import fcntl
+
+    r, w = os.pipe()
+    try:
+        _set_pipe_size(r)
+        # F_GETPIPE_SZ; the resize may be refused by fs.pipe-max-size, in which case the default stays
+        assert fcntl.fcntl(r, getattr(fcntl, "F_GETPIPE_SZ", 1032)) in (PIPE_BUFFER_SIZE, 65536)
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+@pytest.mark.parametrize(
+    "env,expected",
+    [
+        (None, None),
+        ({}, {}),
+        ({"RAMALAMA_TEST_ENV": "set"}, None),
+        ({"RAMALAMA_TEST_ENV": "changed"}, {"RAMALAMA_TEST_ENV": "changed"}),
+        ({"RAMALAMA_TEST_OTHER": "new"}, {"RAMALAMA_TEST_ENV": "set", "RAMALAMA_TEST_OTHER": "new"}),
+    ],
+)
+@patch("ramalama.common.subprocess.run")
+def test_run_cmd_env(mock_run, env, expected):
+    with patch.dict(os.environ, {"RAMALAMA_TEST_ENV": "set"}):
+        run_cmd(["true"], env=env)
+        passed_env = mock_run.call_args.kwargs["env"]
+        if expected:
+            assert passed_env == os.environ | expected
+        else:
+            assert passed_env == expected
+
+
+def test_available_caches_lookups(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with patch("ramalama.common.shutil.which", side_effect=lambda cmd, path: None) as mock_which:
+        assert available("ramalama-test-binary") is False
+        assert available("ramalama-test-binary") is False
+        mock_which.assert_called_once_with("ramalama-test-binary", path=str(tmp_path))
+
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{tmp_path}")
+        assert available("ramalama-test-binary") is False
+        assert mock_which.call_count == 2
+
+
+def test_genname():
+    names = {genname() for _ in range(100)}
+
+    assert len(names) == 100
+    for name in names:
+        assert re.fullmatch(r"ramalama-[a-z2-7]{10}", name)
+
+
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        ("", ""),
+        ("model.gguf", "model.gguf"),
+        ("sha256:abc", "sha256-abc"),
+        ("a:b:c", "a-b-c"),
+    ],
+)
+def test_sanitize_filename(filename: str, expected: str):
+    assert sanitize_filename(filename) == expected
+
+
+@pytest.mark.parametrize(
+    "image,expected",
+    [
+        ("quay.io/ramalama/ramalama", f"quay.io/ramalama/ramalama:{minor_release()}"),
+        ("quay.io/ramalama/ramalama:1.0", "quay.io/ramalama/ramalama:1.0"),
+        ("localhost:5000/ramalama", f"localhost:5000/ramalama:{minor_release()}"),
+        ("localhost:5000/ramalama:1.0", "localhost:5000/ramalama:1.0"),
+    ],
+)
+def test_version_tagged_image(image: str, expected: str):
+    assert version_tagged_image(image) == expected
+    assert latest_tagged_image(image) == expected.replace(f":{minor_release()}", ":latest")
+
+
+@pytest.mark.parametrize("entrypoint", [None, "/usr/bin/entrypoint.sh"])
+def test_container_entrypoint(entrypoint):
+    ep = ContainerEntryPoint(entrypoint)
+
+    assert isinstance(ep, str)
+    assert ep.entrypoint == entrypoint
+    assert str(ep) == str(entrypoint)
+    assert repr(ep) == repr(entrypoint)
+    assert not hasattr(ep, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        (["podman", "run", "--rm"], "podman run --rm"),
+        (["echo", "a b"], "echo 'a b'"),
+        (["echo", 'a"b', "$HOME"], "echo 'a\"b' '$HOME'"),
+        (["echo", ""], "echo ''"),
+    ],
+)
+def test_quoted(args, expected):
+    assert quoted(args) == expected
@@ -1,5 +1,6 @@
 # tests/test_compose.py
 
+import shlex
 from pathlib import Path
 
 import pytest
@@ -142,6 +143,24 @@ DATA_PATH = Path(__file__).parent / "data" / "test_compose"
             ),
             "with_nvidia_gpu.yaml",
         ),
+        (
+            Input(
+                model_name="gemma-rocm",
+                model_src_path="/models/gemma.gguf",
+                model_dest_path="/mnt/models/gemma.gguf",
+                args=Args(image="test-image/ROCm:latest"),
+            ),
+            "with_rocm_gpu.yaml",
+        ),
+        (
+            Input(
+                model_name="gemma-rocm",
+                model_src_path="/models/gemma.gguf",
+                model_dest_path="/mnt/models/gemma.gguf",
+                args=Args(image="ghcr.io/acme/gpu-runtime:rocm-6.2"),
+            ),
+            "with_rocm_gpu_runtime.yaml",
+        ),
         (
             Input(
                 model_name="tinyllama",
@@ -263,3 +282,22 @@ def test_compose_no_devices(monkeypatch):
     result = compose.generate().content
 
     assert "devices:" not in result
+
+
+@pytest.mark.parametrize(
+    "exec_args",
+    [
+        ["llama-server", "--port", "8080", "--model", "/mnt/models/model.file", "--alias=x:y@1,2%"],
+        ["llama-server", "--chat-template", "{{ messages }}"],
+        ["llama-server", "--prompt", ""],
+        ["llama-server", "--alias", "modèle"],
+        ["sh", "-c", "echo $HOME; ls 'a b'"],
+    ],
+)
+def test_compose_command_quoting(exec_args, monkeypatch):
+    """Test that the command line is quoted exactly like shlex.join."""
+    monkeypatch.setattr("os.path.exists", lambda path: False)
+
+    compose = Compose("test", ("/a", "/b"), None, None, Args(), exec_args)
+
+    assert compose._gen_command() == f"    command: {shlex.join(exec_args)}"
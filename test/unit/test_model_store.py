@@ -1,8 +1,10 @@
 import os
+import urllib.error
+from unittest.mock import patch
 
 import pytest
 
-from ramalama.common import generate_sha256_binary
+from ramalama.common import generate_sha256_binary, verify_checksums
 from ramalama.model_store.global_store import GlobalModelStore
 from ramalama.model_store.reffile import RefJSONFile, StoreFile, StoreFileType
 from ramalama.model_store.snapshot_file import (
@@ -112,3 +114,97 @@ def test_local_snapshot_file_binary_download_and_digest(tmp_path):
 
     # Assert: digest matches generate_sha256_binary(content)
     assert snapshot_file.hash == expected_digest
+
+
+class FlakySnapshotFile(LocalSnapshotFile):
+    """Writes corrupted content for the first `failures` downloads"""
+
+    def __init__(self, *args, failures: int = 1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+        self.downloads = 0
+
+    def download(self, blob_file_path, snapshot_dir):
+        self.downloads += 1
+        if self.downloads <= self.failures:
+            with open(blob_file_path, "wb") as file:
+                file.write(self.content[::-1])
+            return os.path.relpath(blob_file_path, start=snapshot_dir)
+        return super().download(blob_file_path, snapshot_dir)
+
+
+class MissingSnapshotFile(SnapshotFile):
+    def download(self, blob_file_path, snapshot_dir):
+        raise urllib.error.HTTPError(self.url, 404, "Not Found", None, None)
+
+
+def _new_snapshot(tmp_path, snapshot_files):
+    model_store = ModelStore(
+        GlobalModelStore(str(tmp_path)), model_name="sample", model_type="url", model_organization="org"
+    )
+    ref_file = model_store._prepare_new_snapshot("latest", "snap123", snapshot_files)
+    return model_store, ref_file
+
+
+def test_download_snapshot_files_retries_checksum_mismatch(tmp_path):
+    model = LocalSnapshotFile(b"model-content", "model.gguf", SnapshotFileType.GGUFModel, should_verify_checksum=True)
+    flaky = FlakySnapshotFile(b"flaky-content", "config.json", SnapshotFileType.Other, should_verify_checksum=True)
+    template = LocalSnapshotFile(b"{{ prompt }}", "chat_template", SnapshotFileType.ChatTemplate)
+    snapshot_files = [model, flaky, template]
+    model_store, ref_file = _new_snapshot(tmp_path, snapshot_files)
+
+    model_store._download_snapshot_files(ref_file, "snap123", snapshot_files)
+
+    assert flaky.downloads == 2
+    for file in snapshot_files:
+        link_path = model_store.get_snapshot_file_path("snap123", file.name)
+        with open(link_path, "rb") as f:
+            assert f.read() == file.content
+
+
+def test_download_snapshot_files_checksum_mismatch_after_retry(tmp_path):
+    model = LocalSnapshotFile(b"model-content", "model.gguf", SnapshotFileType.GGUFModel, should_verify_checksum=True)
+    flaky = FlakySnapshotFile(
+        b"flaky-content", "config.json", SnapshotFileType.Other, should_verify_checksum=True, failures=2
+    )
+    model_store, ref_file = _new_snapshot(tmp_path, [model, flaky])
+
+    with pytest.raises(ValueError, match="Checksum verification failed"):
+        model_store._download_snapshot_files(ref_file, "snap123", [model, flaky])
+    assert flaky.downloads == 2
+
+
+def test_download_snapshot_files_skips_missing_optional_file(tmp_path):
+    model = LocalSnapshotFile(b"model-content", "model.gguf", SnapshotFileType.GGUFModel, should_verify_checksum=True)
+    missing = MissingSnapshotFile(
+        url="https://example.com/missing",
+        header={},
+        hash=generate_sha256_binary(b"missing"),
+        name="missing.json",
+        type=SnapshotFileType.Other,
+        should_verify_checksum=True,
+        required=False,
+    )
+    model_store, ref_file = _new_snapshot(tmp_path, [model, missing])
+
+    with patch("ramalama.model_store.store.verify_checksums", wraps=verify_checksums) as mock_verify:
+        model_store._download_snapshot_files(ref_file, "snap123", [model, missing])
+
+    mock_verify.assert_called_once_with([model_store.get_blob_file_path(model.hash)])
+    assert os.path.exists(model_store.get_snapshot_file_path("snap123", model.name))
+    assert not os.path.lexists(model_store.get_snapshot_file_path("snap123", missing.name))
+    assert [file.hash for file in ref_file.files] == [model.hash]
+
+
+def test_download_snapshot_files_missing_required_file(tmp_path):
+    model = MissingSnapshotFile(
+        url="https://example.com/missing",
+        header={},
+        hash=generate_sha256_binary(b"missing"),
+        name="model.gguf",
+        type=SnapshotFileType.GGUFModel,
+    )
+    model_store, ref_file = _new_snapshot(tmp_path, [model])
+
+    with pytest.raises(urllib.error.HTTPError):
+        model_store._download_snapshot_files(ref_file, "snap123", [model])